@@ -9,7 +9,6 @@ word clouds from Wikipedia categories.
 from flask import Flask, render_template, request, jsonify
 import sys
 import os
-import json
 from collections import Counter
 
 # Add the wiki_analyzer.py directory to the Python path
@@ -18,7 +17,7 @@ sys.path.append(wiki_analyzer_path)
 
 # Import functions from wiki_analyzer.py
 try:
-    from wiki_analyzer import analyze_category, download_nltk_resources, load_from_cache, get_cache_filename
+    from wiki_analyzer import refresh_category, download_nltk_resources, load_top_words_from_cache, list_cached_categories
     print(f"Successfully imported wiki_analyzer from {wiki_analyzer_path}")
 except ImportError as e:
     print(f"Error importing wiki_analyzer: {e}")
@@ -56,21 +55,23 @@ def analyze():
         # Check if we have cached results
         is_cached = False
         if use_cache:
-            is_cached, cached_results = load_from_cache(category)
+            is_cached, top_words, total_words = load_top_words_from_cache(category, top_n)
+            is_cached = is_cached and total_words > 0
             print(f"Cache status for {category}: {'Found' if is_cached else 'Not found'}")
         
-        if is_cached and cached_results and len(cached_results) > 0:
-            word_counts = cached_results
+        if is_cached:
             source = "cache"
-            print(f"Loaded {len(word_counts)} words from cache")
+            print(f"Loaded {total_words} words from cache")
         else:
-            # Analyze the category
-            word_counts = analyze_category(category, top_n, use_cache)
+            # The cache has already been checked, so only page extracts may come from cache
+            word_counts = refresh_category(category, use_cache)
+            top_words = word_counts.most_common(top_n)
+            total_words = len(word_counts)
             source = "fresh analysis"
-            print(f"Analyzed {len(word_counts)} words from {category}")
+            print(f"Analyzed {total_words} words from {category}")
         
         # Get the top N words
-        top_words = dict(word_counts.most_common(top_n))
+        top_words = dict(top_words)
         
         if not top_words:
             return jsonify({'error': 'No words found in the category. Try another category.'}), 404
@@ -79,7 +80,7 @@ def analyze():
             'category': category,
             'words': top_words,
             'source': source,
-            'total_words': len(word_counts)
+            'total_words': total_words
         })
     except Exception as e:
         print(f"Error analyzing category: {str(e)}")
@@ -90,29 +91,7 @@ def analyze():
 @app.route('/cached-categories')
 def cached_categories():
     """Return a list of cached categories."""
-    cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'wiki_word_frequency', 'cache')
-    
-    if not os.path.exists(cache_dir):
-        return jsonify([])
-    
-    cached = []
-    for filename in os.listdir(cache_dir):
-        if filename.endswith('.json'):
-            try:
-                with open(os.path.join(cache_dir, filename), 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    word_count = len(data.get('word_counts', {}))
-                    if word_count > 0:  # Only include categories with words
-                        cached.append({
-                            'category': data.get('category', 'Unknown'),
-                            'timestamp': data.get('timestamp', 'Unknown'),
-                            'word_count': word_count
-                        })
-            except Exception as e:
-                print(f"Error reading cache file {filename}: {e}")
-                continue
-    
-    return jsonify(cached)
+    return jsonify(list_cached_categories())
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
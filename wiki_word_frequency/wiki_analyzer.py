@@ -7,13 +7,23 @@ frequency of non-common words across all pages in that category.
 """
 
 import sys
+import asyncio
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
-import string
-import json
+import gzip
+import orjson
+import pickle
 import os
 import hashlib
-from collections import Counter
+import threading
+import multiprocessing
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import filterfalse
 import argparse
 from nltk.corpus import stopwords
 import nltk
@@ -22,6 +32,59 @@ from datetime import datetime
 # Define cache directory
 CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
 
+# Name of the index of cached categories, kept inside the cache directory
+INDEX_FILENAME = "_index.json"
+
+# Wikipedia API endpoint
+API_URL = "https://en.wikipedia.org/w/api.php"
+
+# Maximum number of page requests in flight at once
+MAX_CONCURRENT_REQUESTS = 16
+
+# Maximum number of titles the API accepts in a single query
+MAX_TITLES_PER_REQUEST = 50
+
+# Retries for throttled (429) or unavailable (503) API responses, and the
+# base delay in seconds used when the response has no Retry-After header
+MAX_RETRIES = 4
+RETRY_BACKOFF = 1.0
+RETRY_STATUSES = (429, 503)
+
+# Headers sent with every API request (Wikipedia requires a User-Agent)
+HEADERS = {
+    "User-Agent": "wiki-word-frequency/1.0 (https://github.com/subodhnarayan/WIKI_WORD_FREQUNCY_CLOUD)",
+    "Accept-Encoding": "gzip"
+}
+
+# Shared session so connections to the API are kept alive between calls
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_maxsize=32, max_retries=Retry(
+    total=MAX_RETRIES, backoff_factor=RETRY_BACKOFF, status_forcelist=RETRY_STATUSES,
+    respect_retry_after_header=True)))
+SESSION.headers.update(HEADERS)
+
+# Words of two or more letters; punctuation, digits and underscores split words
+_TOKEN_RE = re.compile(r'[^\W\d_]{2,}')
+
+# English stopwords, loaded on first use by get_stopwords()
+_STOPWORDS = None
+
+# Number of top words stored precomputed in each cache file
+TOP_WORDS_CACHED = 1000
+
+# Parsed cache files kept in memory, most recently used last:
+# category -> (file mtime, cache data with word_counts as a Counter)
+MEM_CACHE_SIZE = 32
+_MEM_CACHE = OrderedDict()
+_MEM_CACHE_LOCK = threading.Lock()
+
+# Serializes updates to the cache index within this process
+_INDEX_LOCK = threading.Lock()
+
+# Worker pool for counting words, created on first use by _get_executor()
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
 def download_nltk_resources():
     """Download required NLTK resources if not already present."""
     try:
@@ -30,6 +93,19 @@ def download_nltk_resources():
         print("Downloading NLTK stopwords...")
         nltk.download('stopwords', quiet=True)
 
+def get_stopwords():
+    """
+    Return the set of English stopwords, loading it on first use.
+    
+    Returns:
+        frozenset: English stopwords
+    """
+    global _STOPWORDS
+    if _STOPWORDS is None:
+        download_nltk_resources()
+        _STOPWORDS = frozenset(stopwords.words('english'))
+    return _STOPWORDS
+
 def get_cache_filename(category):
     """
     Generate a cache filename based on the category name.
@@ -40,28 +116,226 @@ def get_cache_filename(category):
     Returns:
         str: Cache filename
     """
-    # Create a hash of the category name for the filename
-    category_hash = hashlib.md5(category.encode('utf-8')).hexdigest()
-    return os.path.join(CACHE_DIR, f"{category_hash}.json")
+    # Create a short hash of the category name for the filename
+    category_hash = hashlib.blake2b(category.encode('utf-8'), digest_size=8).hexdigest()
+    return os.path.join(CACHE_DIR, f"{category_hash}.pkl")
 
-def load_from_cache(category):
+def get_legacy_cache_filenames(category):
     """
-    Load cached results for a category if available.
+    Generate the filenames used by older cache versions, newest first.
+    
+    Older versions named cache files after the MD5 hash of the category.
     
     Args:
         category (str): The Wikipedia category name
         
     Returns:
-        tuple: (is_cached, word_counts) where word_counts is a Counter object if cached, None otherwise
+        list: Legacy cache filenames (pickle, gzipped JSON, then plain JSON)
+    """
+    category_hash = hashlib.md5(category.encode('utf-8')).hexdigest()
+    return [os.path.join(CACHE_DIR, f"{category_hash}{ext}") for ext in ('.pkl', '.json.gz', '.json')]
+
+def _check_cache_file_trusted(cache_file):
+    """
+    Refuse to unpickle files that another user could have written.
+    
+    Raises:
+        PermissionError: If the file is owned by another user or is world-writable
+    """
+    if not hasattr(os, 'getuid'):
+        return
+    st = os.stat(cache_file)
+    if st.st_uid != os.getuid() or st.st_mode & 0o002:
+        raise PermissionError(f"Refusing to load untrusted cache file {cache_file}")
+
+def read_cache_file(cache_file):
+    """
+    Read a cache file in the pickle format or a legacy JSON format.
+    
+    Args:
+        cache_file (str): Path of the cache file
+        
+    Returns:
+        dict: The cached data
+    """
+    if cache_file.endswith('.pkl'):
+        _check_cache_file_trusted(cache_file)
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    
+    # Read the whole file at once and let the parser decode the bytes
+    with open(cache_file, 'rb') as f:
+        raw = f.read()
+    
+    if cache_file.endswith('.json.gz'):
+        raw = gzip.decompress(raw)
+    return orjson.loads(raw)
+
+def write_cache_file(cache_file, cache_data):
+    """
+    Atomically write cache data as a pickle.
+    
+    The data is written to a temporary file that then replaces the cache
+    file, so concurrent readers never see a partially written pickle.
+    
+    Args:
+        cache_file (str): Path of the cache file
+        cache_data (dict): The data to cache
+    """
+    tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(cache_data, f, protocol=5)
+        os.replace(tmp_file, cache_file)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+
+def _is_cache_filename(filename):
+    """Return True if filename is a category cache file in either format."""
+    return filename.endswith(('.pkl', '.json.gz', '.json')) and filename != INDEX_FILENAME
+
+def _index_entry(cache_data, mtime):
+    """Build the index entry describing a cache file."""
+    return {
+        'category': cache_data.get('category', 'Unknown'),
+        'timestamp': cache_data.get('timestamp', 'Unknown'),
+        'word_count': len(cache_data.get('word_counts', {})),
+        'mtime': mtime
+    }
+
+def _load_index():
+    """Load the cache index, returning an empty index if it is missing or unreadable."""
+    try:
+        with open(os.path.join(CACHE_DIR, INDEX_FILENAME), 'rb') as f:
+            return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+
+def _save_index(index):
+    """Atomically replace the cache index."""
+    index_file = os.path.join(CACHE_DIR, INDEX_FILENAME)
+    tmp_file = f"{index_file}.{os.getpid()}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(orjson.dumps(index))
+    os.replace(tmp_file, index_file)
+
+def _update_index(cache_file, cache_data):
+    """Record a freshly written cache file in the cache index."""
+    with _INDEX_LOCK:
+        index = _load_index()
+        index[os.path.basename(cache_file)] = _index_entry(cache_data, os.stat(cache_file).st_mtime_ns)
+        _save_index(index)
+
+def list_cached_categories():
+    """
+    List the categories that have cached results.
+    
+    Category details are read from the cache index. Cache files are only
+    parsed if they are missing from the index or were modified since they
+    were indexed, and the index is rewritten if anything changed.
+    
+    Returns:
+        list: Dicts with the category, timestamp and word_count of each
+        cached category that has words
+    """
+    if not os.path.isdir(CACHE_DIR):
+        return []
+    
+    with _INDEX_LOCK:
+        index = _load_index()
+        current = {}
+        with os.scandir(CACHE_DIR) as entries:
+            for entry in entries:
+                if not entry.is_file() or not _is_cache_filename(entry.name):
+                    continue
+                
+                mtime = entry.stat().st_mtime_ns
+                item = index.get(entry.name)
+                if item is None or item.get('mtime') != mtime:
+                    try:
+                        item = _index_entry(read_cache_file(entry.path), mtime)
+                    except Exception as e:
+                        print(f"Error reading cache file {entry.name}: {e}")
+                        continue
+                current[entry.name] = item
+        
+        if current != index:
+            _save_index(current)
+    
+    return [
+        {key: item[key] for key in ('category', 'timestamp', 'word_count')}
+        for item in current.values()
+        if item['word_count'] > 0  # Only include categories with words
+    ]
+
+def _remember_cache_data(category, mtime, cache_data):
+    """Store parsed cache data in the in-memory cache, evicting the least recently used entry."""
+    with _MEM_CACHE_LOCK:
+        _MEM_CACHE[category] = (mtime, cache_data)
+        _MEM_CACHE.move_to_end(category)
+        while len(_MEM_CACHE) > MEM_CACHE_SIZE:
+            _MEM_CACHE.popitem(last=False)
+
+def _read_cache_data(category, cache_file):
+    """
+    Return the parsed contents of a category's cache file.
+    
+    The file is only parsed if it is not in the in-memory cache or has been
+    modified since it was last read.
+    """
+    mtime = os.stat(cache_file).st_mtime_ns
+    with _MEM_CACHE_LOCK:
+        hit = _MEM_CACHE.get(category)
+        if hit and hit[0] == mtime:
+            _MEM_CACHE.move_to_end(category)
+            return hit[1]
+    
+    cache_data = read_cache_file(cache_file)
+    # Legacy JSON caches store a plain dictionary; convert it back to a Counter object
+    if not isinstance(cache_data.get('word_counts'), Counter):
+        cache_data['word_counts'] = Counter(cache_data.get('word_counts', {}))
+    # Caches written by older versions do not store the top words yet
+    if 'top_words' not in cache_data:
+        cache_data['top_words'] = cache_data['word_counts'].most_common(TOP_WORDS_CACHED)
+    _remember_cache_data(category, mtime, cache_data)
+    return cache_data
+
+def _load_cache_data(category):
+    """
+    Load the cache data for a category if it is cached and not expired.
+    
+    Cache files left by older versions are migrated to the current name and
+    format on first read.
+    
+    Returns:
+        dict: The cache data, or None if there is no usable cache
     """
     cache_file = get_cache_filename(category)
     
     if not os.path.exists(cache_file):
-        return False, None
+        legacy_files = [f for f in get_legacy_cache_filenames(category) if os.path.exists(f)]
+        if not legacy_files:
+            return None
+        
+        try:
+            if legacy_files[0].endswith('.pkl'):
+                os.replace(legacy_files[0], cache_file)
+            else:
+                cache_data = read_cache_file(legacy_files[0])
+                cache_data['word_counts'] = Counter(cache_data.get('word_counts', {}))
+                write_cache_file(cache_file, cache_data)
+                os.remove(legacy_files[0])
+            for legacy_file in legacy_files[1:]:
+                os.remove(legacy_file)
+            print(f"Migrated cache for '{category}' to {cache_file}")
+        except Exception as e:
+            print(f"Error migrating cache: {e}")
+            cache_file = legacy_files[0]
     
     try:
-        with open(cache_file, 'r', encoding='utf-8') as f:
-            cache_data = json.load(f)
+        cache_data = _read_cache_data(category, cache_file)
             
         # Check if cache is expired (older than 7 days)
         cache_date = datetime.fromisoformat(cache_data.get('timestamp', '2000-01-01'))
@@ -70,16 +344,58 @@ def load_from_cache(category):
         
         if days_diff > 7:
             print(f"Cache for '{category}' is {days_diff} days old. Refreshing...")
-            return False, None
+            return None
             
         print(f"Loading cached results for '{category}' (cached on {cache_data.get('timestamp')})")
-        
-        # Convert the cached dictionary back to a Counter object
-        word_counts = Counter(cache_data.get('word_counts', {}))
-        return True, word_counts
+        return cache_data
     except Exception as e:
         print(f"Error loading cache: {e}")
+        return None
+
+def load_from_cache(category):
+    """
+    Load cached results for a category if available.
+    
+    Parsed results are kept in memory, so the returned Counter is shared and
+    must not be modified.
+    
+    Args:
+        category (str): The Wikipedia category name
+        
+    Returns:
+        tuple: (is_cached, word_counts) where word_counts is a Counter object if cached, None otherwise
+    """
+    cache_data = _load_cache_data(category)
+    if cache_data is None:
         return False, None
+    return True, cache_data['word_counts']
+
+def load_top_words_from_cache(category, top_n):
+    """
+    Load the most frequent words of a category from cache if available.
+    
+    The top TOP_WORDS_CACHED words are stored precomputed in the cache, so
+    they are sliced rather than recomputed from the full counter.
+    
+    Args:
+        category (str): The Wikipedia category name
+        top_n (int): Number of top words to return
+        
+    Returns:
+        tuple: (is_cached, top_words, total_words) where top_words is a list of
+        (word, count) pairs if cached, None otherwise
+    """
+    cache_data = _load_cache_data(category)
+    if cache_data is None:
+        return False, None, 0
+    
+    # Match most_common(), which returns nothing for a negative count
+    top_n = max(top_n, 0)
+    word_counts = cache_data['word_counts']
+    top_words = cache_data['top_words']
+    if top_n > len(top_words) and len(top_words) < len(word_counts):
+        top_words = word_counts.most_common(top_n)
+    return True, top_words[:top_n], len(word_counts)
 
 def save_to_cache(category, word_counts):
     """
@@ -93,15 +409,18 @@ def save_to_cache(category, word_counts):
         os.makedirs(CACHE_DIR)
         
     cache_file = get_cache_filename(category)
+    word_counts = Counter(word_counts)
     
     cache_data = {
         'category': category,
         'timestamp': datetime.now().isoformat(),
-        'word_counts': dict(word_counts)
+        'word_counts': word_counts,
+        'top_words': word_counts.most_common(TOP_WORDS_CACHED)
     }
     
-    with open(cache_file, 'w', encoding='utf-8') as f:
-        json.dump(cache_data, f, ensure_ascii=False, indent=2)
+    write_cache_file(cache_file, cache_data)
+    _update_index(cache_file, cache_data)
+    _remember_cache_data(category, os.stat(cache_file).st_mtime_ns, cache_data)
     
     print(f"Results cached to {cache_file}")
 
@@ -115,9 +434,6 @@ def get_pages_in_category(category):
     Returns:
         list: List of page titles in the category
     """
-    session = requests.Session()
-    url = "https://en.wikipedia.org/w/api.php"
-    
     # Remove "Category:" prefix if present
     if category.startswith("Category:"):
         category = category[9:]
@@ -141,17 +457,18 @@ def get_pages_in_category(category):
             "list": "categorymembers",
             "cmtitle": f"Category:{cat}",
             "cmlimit": "500",  # Maximum allowed by API
-            "format": "json"
+            "format": "json",
+            "formatversion": "2"
         }
         
         print(f"Trying category: {cat}")
-        print(f"API URL: {url}")
+        print(f"API URL: {API_URL}")
         print(f"API params: {params}")
         
         try:
-            response = session.get(url=url, params=params, timeout=30)
+            response = SESSION.get(url=API_URL, params=params, timeout=30)
             response.raise_for_status()  # Raise exception for 4XX/5XX responses
-            data = response.json()
+            data = orjson.loads(response.content)
             
             # Debug information
             print(f"API response status code: {response.status_code}")
@@ -164,6 +481,8 @@ def get_pages_in_category(category):
                         pages.append(member["title"])
                 
                 if pages:
+                    # Drop duplicate titles while keeping their order
+                    pages = list(dict.fromkeys(pages))
                     print(f"Found {len(pages)} pages in category '{cat}'")
                     return pages
             else:
@@ -177,71 +496,354 @@ def get_pages_in_category(category):
     print("WARNING: No pages found in any category variation. The category might not exist or might be empty.")
     return []
 
-def get_page_content(page_title):
+def _retry_delay(retry_after, attempt):
+    """Return how long to wait before retrying, preferring the server's Retry-After."""
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        return RETRY_BACKOFF * 2 ** attempt
+
+async def _get_json(session, params):
     """
-    Fetch the content of a Wikipedia page.
+    Send an API request and parse the JSON response.
+    
+    Throttled and unavailable responses are retried up to MAX_RETRIES times
+    with exponential backoff, honouring the Retry-After header.
+    
+    Raises:
+        aiohttp.ClientResponseError: If the request still fails after retrying
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        async with session.get(API_URL, params=params) as response:
+            if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                response.raise_for_status()
+                return orjson.loads(await response.read())
+            delay = _retry_delay(response.headers.get("Retry-After"), attempt)
+        
+        print(f"API returned {response.status}. Retrying in {delay:g}s...")
+        await asyncio.sleep(delay)
+
+async def fetch_pages(session, titles):
+    """
+    Fetch the content of a batch of Wikipedia pages using an aiohttp session.
+    
+    The API may return fewer extracts than requested, so continuation
+    requests are issued until every page in the batch has been returned.
     
     Args:
-        page_title (str): The title of the Wikipedia page
+        session (aiohttp.ClientSession): The session to issue the requests with
+        titles (list): Up to MAX_TITLES_PER_REQUEST page titles
         
     Returns:
-        str: The text content of the page
+        list: (title, extract, revid) tuples for the pages in the batch, where
+        revid is the page's latest revision id, or None if the API reported none
+        
+    Raises:
+        aiohttp.ClientError, asyncio.TimeoutError: If any request fails, so that
+        incomplete results are never cached
     """
-    session = requests.Session()
-    url = "https://en.wikipedia.org/w/api.php"
-    
     params = {
         "action": "query",
-        "prop": "extracts",
-        "exlimit": "1",
+        "prop": "extracts|info",  # info adds the page's latest revision id
+        "exlimit": "max",
         "explaintext": "1",  # Get plain text content
-        "titles": page_title,
-        "format": "json"
+        "titles": "|".join(titles),
+        "format": "json",
+        "formatversion": "2"  # Return pages as a list rather than keyed by page id
     }
     
-    response = session.get(url=url, params=params)
-    data = response.json()
+    extracts = {}
+    # info is only included until it is complete, usually in the first response
+    revids = {}
+    while True:
+        data = await _get_json(session, params)
+        
+        # Extract the page contents
+        for page in data.get("query", {}).get("pages", []):
+            if "extract" in page:
+                extracts[page["title"]] = page["extract"]
+            if "lastrevid" in page:
+                revids[page["title"]] = page["lastrevid"]
+        
+        if "continue" not in data:
+            break
+        params.update(data["continue"])
+    
+    return [(title, extracts.get(title, ""), revids.get(title)) for title in titles]
+
+async def fetch_revisions(session, titles):
+    """
+    Fetch the latest revision ids of a batch of Wikipedia pages.
+    
+    Args:
+        session (aiohttp.ClientSession): The session to issue the request with
+        titles (list): Up to MAX_TITLES_PER_REQUEST page titles
+        
+    Returns:
+        dict: Latest revision id keyed by page title; empty if the request failed
+    """
+    params = {
+        "action": "query",
+        "prop": "info",
+        "titles": "|".join(titles),
+        "format": "json",
+        "formatversion": "2"
+    }
+    
+    try:
+        data = await _get_json(session, params)
+    except Exception as e:
+        print(f"Error fetching revisions {titles[0]!r}..{titles[-1]!r}: {e}")
+        return {}
     
-    # Extract the page content
-    pages = data["query"]["pages"]
-    page_id = list(pages.keys())[0]
+    return {
+        page["title"]: page["lastrevid"]
+        for page in data.get("query", {}).get("pages", [])
+        if "lastrevid" in page
+    }
+
+def _client_session():
+    """Create an aiohttp session for API requests."""
+    return aiohttp.ClientSession(headers=HEADERS, timeout=aiohttp.ClientTimeout(total=30))
+
+async def _bounded(semaphore, coro):
+    """Await a coroutine while holding the given semaphore."""
+    async with semaphore:
+        return await coro
+
+def _batch_titles(titles):
+    """
+    Split titles into batches for the extracts API.
     
-    if "extract" in pages[page_id]:
-        return pages[page_id]["extract"]
-    return ""
+    Batches are kept small enough that there are at least
+    MAX_CONCURRENT_REQUESTS of them, so small categories still benefit
+    from concurrency when the API returns one extract per request.
+    """
+    size = -(-len(titles) // MAX_CONCURRENT_REQUESTS)
+    size = max(1, min(MAX_TITLES_PER_REQUEST, size))
+    return [titles[i:i + size] for i in range(0, len(titles), size)]
 
 def process_text(text):
     """
     Process text to extract words and remove common words.
     
+    The words are produced lazily, so they can be fed straight into
+    Counter.update without building an intermediate list.
+    
     Args:
         text (str): The text to process
         
     Returns:
-        list: List of processed words
+        iterator: Processed words
     """
-    # Convert to lowercase
-    text = text.lower()
+    # Extract words from the lowercased text and remove common words (stopwords)
+    return filterfalse(get_stopwords().__contains__, _TOKEN_RE.findall(text.lower()))
+
+def count_texts(texts):
+    """
+    Count the words of several texts after removing common words.
     
-    # Remove punctuation
-    text = re.sub(f'[{re.escape(string.punctuation)}]', ' ', text)
+    Runs in a worker process, so it must stay at module level to be picklable.
     
-    # Remove numbers
-    text = re.sub(r'\d+', '', text)
+    Args:
+        texts (list): The texts to process
+        
+    Returns:
+        Counter: Combined word frequency counter for the texts
+    """
+    word_counts = Counter()
+    for text in texts:
+        word_counts.update(process_text(text))
+    return word_counts
+
+def _get_executor():
+    """
+    Return the shared worker pool used to count words, creating it on first use.
     
-    # Split into words
-    words = text.split()
+    Workers are spawned rather than forked, since the pool may be started from
+    a multithreaded process (aiohttp resolver threads, Flask request threads).
+    Each worker loads the stopwords once when it starts. A pool that broke
+    because a worker died is replaced, since it cannot run any more tasks.
     
-    # Remove common words (stopwords)
-    stop_words = set(stopwords.words('english'))
-    words = [word for word in words if word not in stop_words and len(word) > 1]
+    Spawned workers import the caller's main module as __mp_main__, so a
+    script that counts words must keep its top-level code under an
+    if __name__ == "__main__": guard. The forkserver start method would not
+    lift this requirement, since its workers re-import the main module too.
+    """
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is not None and getattr(_EXECUTOR, '_broken', False):
+            _EXECUTOR.shutdown(wait=False)
+            _EXECUTOR = None
+        if _EXECUTOR is None:
+            _EXECUTOR = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"),
+                                            initializer=get_stopwords)
+        return _EXECUTOR
+
+def _discard_executor(executor):
+    """Drop a broken worker pool so that the next _get_executor() call creates a new one."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is executor:
+            _EXECUTOR = None
+    executor.shutdown(wait=False)
+
+def _get_page_cache_filename(title):
+    """Generate the filename of a page's cached extract."""
+    title_hash = hashlib.blake2b(title.encode('utf-8'), digest_size=8).hexdigest()
+    return os.path.join(CACHE_DIR, "pages", f"{title_hash}.pkl")
+
+def load_cached_pages(titles):
+    """
+    Load the cached extracts of the given pages.
     
-    return words
+    Args:
+        titles (list): The titles of the Wikipedia pages
+        
+    Returns:
+        dict: {'title', 'revid', 'extract'} entries keyed by title, for the
+        pages that have a readable cache entry
+    """
+    cached_pages = {}
+    for title in titles:
+        page_file = _get_page_cache_filename(title)
+        if not os.path.exists(page_file):
+            continue
+        try:
+            page = read_cache_file(page_file)
+        except Exception as e:
+            print(f"Error loading cached page '{title}': {e}")
+            continue
+        if page.get('title') == title:
+            cached_pages[title] = page
+    return cached_pages
+
+def save_cached_pages(pages):
+    """
+    Cache page extracts together with the revision they were taken from.
+    
+    Args:
+        pages (list): (title, extract, revid) tuples; pages without a revid are skipped
+    """
+    os.makedirs(os.path.join(CACHE_DIR, "pages"), exist_ok=True)
+    for title, extract, revid in pages:
+        if revid is None:
+            continue
+        try:
+            write_cache_file(_get_page_cache_filename(title),
+                             {'title': title, 'revid': revid, 'extract': extract})
+        except Exception as e:
+            print(f"Error caching page '{title}': {e}")
+
+async def _count_pages(titles, cached_pages, executor, fetched):
+    """
+    Count the words of all pages, reusing cached extracts of unedited pages.
+    
+    Pages are fetched in concurrent batches and each batch is counted in the
+    executor as it arrives. The (title, extract, revid) tuples of downloaded
+    pages are appended to fetched as they arrive. If a batch fails, the
+    remaining batches still complete before the error is raised.
+    
+    Returns:
+        Counter: Word frequency counter for all pages
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    
+    counting = []
+    error = None
+    async with _client_session() as session:
+        to_fetch = titles
+        if cached_pages:
+            # Only pages edited since they were cached need to be fetched again.
+            # prop=info returns every title in one response, so use full batches.
+            cached_titles = list(cached_pages)
+            revisions = {}
+            for batch_revisions in await asyncio.gather(*[
+                _bounded(semaphore, fetch_revisions(session, cached_titles[i:i + MAX_TITLES_PER_REQUEST]))
+                for i in range(0, len(cached_titles), MAX_TITLES_PER_REQUEST)
+            ]):
+                revisions.update(batch_revisions)
+            
+            unchanged = [title for title, page in cached_pages.items() if revisions.get(title) == page['revid']]
+            print(f"Reusing {len(unchanged)} unchanged pages from cache")
+            for i in range(0, len(unchanged), MAX_TITLES_PER_REQUEST):
+                texts = [cached_pages[title]['extract'] for title in unchanged[i:i + MAX_TITLES_PER_REQUEST]]
+                counting.append(loop.run_in_executor(executor, count_texts, texts))
+            
+            unchanged = set(unchanged)
+            to_fetch = [title for title in titles if title not in unchanged]
+        
+        fetches = [_bounded(semaphore, fetch_pages(session, batch)) for batch in _batch_titles(to_fetch)]
+        fetched_count = 0
+        for fetch in asyncio.as_completed(fetches):
+            try:
+                batch = await fetch
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"Error fetching pages: {e!r}")
+                error = error or e
+                continue
+            
+            fetched.extend(batch)
+            fetched_count += len(batch)
+            print(f"Fetched {fetched_count}/{len(to_fetch)} pages")
+            texts = [extract for _, extract, _ in batch]
+            counting.append(loop.run_in_executor(executor, count_texts, texts))
+    
+    word_counts = Counter()
+    for batch_counts in await asyncio.gather(*counting):
+        word_counts.update(batch_counts)
+    
+    # Partial counts must not be mistaken for a complete result
+    if error is not None:
+        raise error
+    return word_counts
+
+def count_pages(titles, use_cache=True):
+    """
+    Fetch Wikipedia pages and count their words across all CPU cores.
+    
+    Extracts are cached per page along with their revision id, so pages that
+    have not been edited since they were cached are not downloaded again.
+    
+    Counting runs in spawned worker processes that import the main module, so
+    scripts calling this must guard their entry point with
+    if __name__ == "__main__":.
+    
+    Args:
+        titles (list): The titles of the Wikipedia pages
+        use_cache (bool): Whether to reuse cached page extracts; fresh
+            extracts are cached either way
+        
+    Returns:
+        Counter: Word frequency counter for all pages
+    """
+    if not titles:
+        return Counter()
+    
+    cached_pages = load_cached_pages(titles) if use_cache else {}
+    fetched = []
+    executor = _get_executor()
+    try:
+        try:
+            word_counts = asyncio.run(_count_pages(titles, cached_pages, executor, fetched))
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); retry once on a fresh pool
+            print("Word counting worker pool broke. Retrying with a new pool...")
+            _discard_executor(executor)
+            word_counts = asyncio.run(_count_pages(titles, cached_pages, _get_executor(), fetched))
+    finally:
+        # Keep the pages that did arrive, even if the analysis as a whole failed
+        save_cached_pages(fetched)
+    return word_counts
 
 def analyze_category(category, top_n=100, use_cache=True):
     """
     Analyze word frequencies across all pages in a category.
     
+    Scripts calling this must guard their entry point with
+    if __name__ == "__main__":; see count_pages().
+    
     Args:
         category (str): The Wikipedia category name
         top_n (int): Number of top words to display
@@ -256,21 +858,32 @@ def analyze_category(category, top_n=100, use_cache=True):
         if is_cached and cached_results and len(cached_results) > 0:
             return cached_results
     
+    return refresh_category(category, use_cache)
+
+def refresh_category(category, use_cache=True):
+    """
+    Analyze word frequencies across all pages in a category without checking
+    for cached category results, and cache the new results.
+    
+    Scripts calling this must guard their entry point with
+    if __name__ == "__main__":; see count_pages().
+    
+    Args:
+        category (str): The Wikipedia category name
+        use_cache (bool): Whether to reuse cached extracts of unedited pages
+        
+    Returns:
+        Counter: Word frequency counter
+    """
     pages = get_pages_in_category(category)
-    all_words = []
     
     if not pages:
         print(f"No pages found in category '{category}'. Cannot analyze word frequencies.")
         return Counter()
     
-    for i, page in enumerate(pages):
-        print(f"Processing page {i+1}/{len(pages)}: {page}")
-        content = get_page_content(page)
-        words = process_text(content)
-        all_words.extend(words)
-    
     # Count word frequencies
-    word_counts = Counter(all_words)
+    print(f"Fetching and processing {len(pages)} pages...")
+    word_counts = count_pages(pages, use_cache)
     
     # Only cache if we actually found words
     if word_counts: